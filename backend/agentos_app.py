@@ -8,17 +8,30 @@ Usage:
     python agentos_app.py
 
 Then open http://localhost:7777 to interact with the OS.
+Set WEB_CONCURRENCY to change the number of uvicorn workers (default 4).
 """
 
+import os
+from contextlib import asynccontextmanager
+
 from agno.os import AgentOS
 
-from team import innovation_team
+from team import close_connections, innovation_team, warm_connections
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    # Pay the TLS handshakes at boot rather than on the first user request.
+    await warm_connections()
+    yield
+    await close_connections()
 
 
 agent_os = AgentOS(
     id="product-innovation-os",
     description="AgentOS exposing the Product Innovation Team workflow.",
     teams=[innovation_team],
+    lifespan=lifespan,
 )
 
 # FastAPI application served by AgentOS.
@@ -26,4 +39,11 @@ app = agent_os.get_app()
 
 
 if __name__ == "__main__":
-    agent_os.serve(app="agentos_app:app")
+    agent_os.serve(
+        app="agentos_app:app",
+        workers=int(os.environ.get("WEB_CONCURRENCY", "4")),
+        # "auto" picks uvloop/httptools when installed (fastapi[standard]) and
+        # falls back to asyncio/h11 otherwise, e.g. on Windows.
+        loop="auto",
+        http="auto",
+    )
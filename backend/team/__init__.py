@@ -1,8 +1,10 @@
 """Team package consolidating product studio components."""
 
-from .innovation_team import innovation_team, run_example
+from .innovation_team import close_connections, innovation_team, run_example, warm_connections
 
 __all__ = [
+    "close_connections",
     "innovation_team",
     "run_example",
+    "warm_connections",
 ]
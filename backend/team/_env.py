@@ -0,0 +1,34 @@
+"""Load the project's .env files into os.environ once per process."""
+
+import os
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+_MODULE_DIR = Path(__file__).resolve().parent
+_PROJECT_ROOT = _MODULE_DIR.parent
+
+_LOADED = False
+
+
+def load_env_variables() -> None:
+    """Populate os.environ from project-level .env files if keys are missing."""
+
+    global _LOADED
+    if _LOADED:
+        return
+
+    env_paths = [
+        _PROJECT_ROOT / ".env",  # project root
+        _MODULE_DIR / ".env",  # team-specific overrides
+    ]
+
+    for env_path in env_paths:
+        if not env_path.exists():
+            continue
+
+        for key, value in dotenv_values(env_path).items():
+            if key and value:
+                os.environ.setdefault(key, value)
+
+    _LOADED = True
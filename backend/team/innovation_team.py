@@ -1,8 +1,21 @@
 """Product Studio Team implementation aligned with TEAM_PLAN.md."""
 
+import asyncio
+import atexit
+import copy
+import importlib.util
 import os
+import pickle
+import random
 import re
-from pathlib import Path
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from string import Template
+from types import MappingProxyType
 from textwrap import dedent
 from uuid import uuid4
 
@@ -12,33 +25,26 @@ from agno.db.sqlite import SqliteDb
 from agno.media import Image
 from agno.utils.log import logger
 from agno.models.openrouter import OpenRouter
+from agno.run.team import TeamRunOutput
 from agno.team import Team
 from agno.tools import tool
 from agno.tools.function import ToolResult
+from agno.utils.team import get_member_id
+from openai import AsyncOpenAI
+from sqlalchemy import create_engine, event
 
+try:
+    import replicate
+    from replicate.helpers import FileOutput
+except ImportError:  # pragma: no cover - replicate is optional
+    replicate = None
+    FileOutput = None
 
-def load_env_variables() -> None:
-    """Populate os.environ from project-level .env files if keys are missing."""
-
-    env_paths = [
-        Path(__file__).resolve().parent.parent / ".env",  # project root
-        Path(__file__).resolve().parent / ".env",  # team-specific overrides
-    ]
-
-    for env_path in env_paths:
-        if not env_path.exists():
-            continue
-
-        for raw_line in env_path.read_text().splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('\'"')
-            if key and value:
-                os.environ.setdefault(key, value)
 
+if __package__:
+    from ._env import _MODULE_DIR, load_env_variables
+else:  # executed directly as a script
+    from _env import _MODULE_DIR, load_env_variables
 
 load_env_variables()
 
@@ -48,40 +54,148 @@ load_env_variables()
 if os.environ.get("OPENROUTER_API_KEY") and not os.environ.get("OPENAI_API_KEY"):
     os.environ.setdefault("OPENAI_API_KEY", os.environ["OPENROUTER_API_KEY"])
 
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]").
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One pooled async client per event loop, shared by every OpenRouter model, so
+# delegations between members reuse warm keep-alive connections instead of a
+# fresh TLS handshake. Pooled connections belong to the loop that opened them,
+# so a new loop (another asyncio.run, a test runner) gets its own client.
+_OPENROUTER_HTTP_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def _openrouter_http_client() -> httpx.AsyncClient:
+    """Return the running loop's pooled OpenRouter client, creating it on first use."""
+
+    loop = asyncio.get_running_loop()
+    client = _OPENROUTER_HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _OPENROUTER_HTTP_CLIENTS[loop] = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+    return client
+
+
+class _PooledOpenRouter(OpenRouter):
+    """OpenRouter model whose async calls go through the running loop's pooled client."""
+
+    def get_async_client(self) -> AsyncOpenAI:
+        return AsyncOpenAI(**self._get_client_params(), http_client=_openrouter_http_client())
+
+
+# Cap each model call: a stalled upstream route costs less to re-issue than to
+# wait out. The OpenAI client applies it per request and, by default, retries
+# timeouts, 429s and 5xx responses twice.
+_LLM_TIMEOUT_S = float(os.environ.get("LLM_TIMEOUT_S", "30"))
+# Reasoning runs (spec/BOM drafts, visual concepts) can legitimately take
+# minutes, and a non-streamed reply only arrives once generation finishes.
+_LLM_REASONING_TIMEOUT_S = float(os.environ.get("LLM_REASONING_TIMEOUT_S", "120"))
+
+# One model object per distinct configuration, shared by every agent using it.
+_GEMINI_FLASH_MODEL = _PooledOpenRouter(
+    id="google/gemini-2.5-flash-preview-09-2025",
+    timeout=_LLM_TIMEOUT_S,
+)
+_GROK_REASONING_MODEL = _PooledOpenRouter(
+    id="x-ai/grok-4-fast",
+    reasoning_effort="medium",
+    timeout=_LLM_REASONING_TIMEOUT_S,
+)
+_GROK_MODEL = _PooledOpenRouter(
+    id="x-ai/grok-4-fast",
+    timeout=_LLM_TIMEOUT_S,
+)
+
+
+APPROVAL_GATES = ("viability", "visuals", "spec")
+_VALID_GATES = frozenset(APPROVAL_GATES)
+
+_OUTPUTS_TEMPLATE = {
+    "images": [],
+    "spec": None,
+    "bom": [],
+    "ingredients": [],
+    "manufacturers": [],
+    "outreach": [],
+}
+
+_DECISION_TEMPLATE = {
+    "status": "pending",
+    "confidence": 0.0,
+    "reasons": [],
+    "assumptions": [],
+    "open_questions": [],
+}
+
+_SESSION_STATE_TEMPLATE = {
+    "stage": "intake",
+    "awaiting_approval": False,
+    "approvals": dict.fromkeys(APPROVAL_GATES, False),
+    "brief": {},
+    "decision": _DECISION_TEMPLATE,
+    "selected_visual": {"option_id": None, "notes": ""},
+    "outputs": _OUTPUTS_TEMPLATE,
+}
+
+
+# Unpickling a pre-serialised copy is several times faster than deepcopy()
+# for this small, pure-data tree.
+_SESSION_STATE_PICKLE = pickle.dumps(_SESSION_STATE_TEMPLATE, protocol=pickle.HIGHEST_PROTOCOL)
+
 
 def initial_session_state() -> dict:
     """Seed session state tracking stage gates and outputs."""
 
-    return {
-        "stage": "intake",
-        "awaiting_approval": False,
-        "approvals": {"viability": False, "visuals": False, "spec": False},
-        "brief": {},
-        "decision": {
-            "status": "pending",
-            "confidence": 0.0,
-            "reasons": [],
-            "assumptions": [],
-            "open_questions": [],
-        },
-        "selected_visual": {"option_id": None, "notes": ""},
-        "outputs": {
-            "images": [],
-            "spec": None,
-            "bom": [],
-            "ingredients": [],
-            "manufacturers": [],
-        },
-    }
+    return pickle.loads(_SESSION_STATE_PICKLE)
 
 
+def _ensure_outputs(session_state) -> dict:
+    """Return session outputs, seeding them from the template when missing."""
+
+    outputs = session_state.get("outputs")
+    if outputs is None:
+        outputs = session_state["outputs"] = copy.deepcopy(_OUTPUTS_TEMPLATE)
+    return outputs
+
+
+# Per-connection tuning: WAL lets readers keep going while a session write
+# commits, and NORMAL sync skips the extra fsync per transaction. busy_timeout
+# makes a writer wait for a concurrent session's lock instead of failing.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+@lru_cache(maxsize=1)
 def team_database() -> SqliteDb:
-    """Ensure a writable sqlite database for multi-turn sessions."""
+    """Ensure a writable sqlite database for multi-turn sessions.
+
+    Memoized so every caller shares one engine and connection pool. The
+    engine connects lazily, so the file is only opened on the first query.
+    """
 
-    data_dir = Path(__file__).resolve().parent / "data"
+    data_dir = _MODULE_DIR / "data"
     data_dir.mkdir(parents=True, exist_ok=True)
     db_file = data_dir / "product_studio.db"
-    return SqliteDb(db_file=str(db_file))
+    engine = create_engine(f"sqlite:///{db_file}")
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return SqliteDb(db_file=str(db_file), db_engine=engine)
 
 
 STAGE_SEQUENCE = [
@@ -93,48 +207,48 @@ STAGE_SEQUENCE = [
     "final",
 ]
 
+_STAGE_IDX = {stage: idx for idx, stage in enumerate(STAGE_SEQUENCE)}
+
+# Approvals required before moving forward into a stage, with the reason
+# reported back to the coordinator when one is missing.
+_STAGE_GATES = {
+    "visuals": (("viability", "viability needs approval first."),),
+    "spec": (
+        ("viability", "viability isn't approved."),
+        ("visuals", "visuals need approval before spec."),
+    ),
+    "sourcing": (("spec", "spec must be approved before sourcing."),),
+    "final": tuple(
+        (gate, f"{gate} approval is still pending.") for gate in APPROVAL_GATES
+    ),
+}
+
 
 def set_stage(session_state, stage: str) -> str:
     """Advance or rewind the current stage."""
 
     stage = stage.lower().strip()
-    if stage not in STAGE_SEQUENCE:
+    target_idx = _STAGE_IDX.get(stage)
+    if target_idx is None:
         return "Stage unchanged. Pick one of: " + ", ".join(STAGE_SEQUENCE)
 
-    current_stage = session_state.get("stage", STAGE_SEQUENCE[0])
-    try:
-        current_idx = STAGE_SEQUENCE.index(current_stage)
-    except ValueError:
+    current_idx = _STAGE_IDX.get(session_state.get("stage", STAGE_SEQUENCE[0]))
+    if current_idx is None:
         current_idx = 0
-        current_stage = STAGE_SEQUENCE[0]
-        session_state["stage"] = current_stage
-
-    target_idx = STAGE_SEQUENCE.index(stage)
+        session_state["stage"] = STAGE_SEQUENCE[0]
 
     # Only enforce gating when moving forward.
     if target_idx > current_idx:
-        approvals = session_state.setdefault(
-            "approvals", {"viability": False, "visuals": False, "spec": False}
-        )
-        selected_visual = session_state.get("selected_visual") or {}
-        unmet_requirements = []
-        if stage == "visuals" and not approvals.get("viability"):
-            unmet_requirements.append("viability needs approval first.")
+        approvals = session_state.setdefault("approvals", dict.fromkeys(APPROVAL_GATES, False))
+        unmet_requirements = [
+            message for gate, message in _STAGE_GATES.get(stage, ()) if not approvals.get(gate)
+        ]
         if stage == "spec":
-            if not approvals.get("viability"):
-                unmet_requirements.append("viability isn't approved.")
-            if not approvals.get("visuals"):
-                unmet_requirements.append("visuals need approval before spec.")
-            if not (selected_visual.get("option_id")):
+            selected_visual = session_state.get("selected_visual") or {}
+            if not selected_visual.get("option_id"):
                 unmet_requirements.append(
                     "capture the chosen visual (use record_visual_choice)."
                 )
-        if stage == "sourcing" and not approvals.get("spec"):
-            unmet_requirements.append("spec must be approved before sourcing.")
-        if stage == "final":
-            for gate in ("viability", "visuals", "spec"):
-                if not approvals.get(gate):
-                    unmet_requirements.append(f"{gate} approval is still pending.")
 
         if unmet_requirements:
             return (
@@ -156,16 +270,32 @@ def mark_approval(session_state, gate: str, value: bool = True) -> str:
     """Update a stage approval toggle."""
 
     gate = gate.lower().strip()
-    approvals = session_state.setdefault(
-        "approvals", {"viability": False, "visuals": False, "spec": False}
-    )
-    if gate not in approvals:
+    if gate not in _VALID_GATES:
         return "Approval untouched. Use viability, visuals, or spec."
 
-    approvals[gate] = value
+    session_state.setdefault("approvals", dict.fromkeys(APPROVAL_GATES, False))[gate] = value
     return f"Marked {gate} approval as {value}."
 
 
+def commit_state_tweaks(
+    session_state,
+    approvals: dict[str, bool] | None = None,
+    awaiting_approval: bool | None = None,
+    stage: str | None = None,
+) -> str:
+    """Apply approvals, the awaiting flag, and a stage move in one call.
+
+    Approvals land first so the stage gate sees them.
+    """
+
+    results = [mark_approval(session_state, gate, value) for gate, value in (approvals or {}).items()]
+    if awaiting_approval is not None:
+        results.append(set_awaiting(session_state, awaiting_approval))
+    if stage:
+        results.append(set_stage(session_state, stage))
+    return " ".join(results) or "No state changes requested."
+
+
 def record_visual_choice(
     session_state, option_id: str, notes: str = ""
 ) -> str:
@@ -186,69 +316,181 @@ def record_brief(session_state, key: str, value: str) -> str:
     return "Brief updated."
 
 
+def record_brief_multi(session_state, details: dict[str, str]) -> str:
+    """Capture several brief details in one call."""
+
+    brief = session_state.setdefault("brief", {})
+    brief.update((key.strip().lower(), str(value).strip()) for key, value in details.items())
+    return f"Brief updated ({len(details)} fields)."
+
+
+def _clean_lines(text: str) -> list[str]:
+    """Split text into stripped, non-empty lines."""
+
+    return [line for line in (raw.strip() for raw in text.split("\n")) if line]
+
+
 def record_spec(session_state, summary: str, bom: str = "", open_items: str = "") -> str:
     """Store the current product spec snapshot."""
 
-    outputs = session_state.setdefault(
-        "outputs",
-        {"images": [], "spec": None, "bom": [], "ingredients": [], "manufacturers": []},
-    )
+    outputs = _ensure_outputs(session_state)
     outputs["spec"] = summary.strip()
     if bom:
-        outputs["bom"] = bom.strip().splitlines()
+        outputs["bom"] = _clean_lines(bom)
     if open_items:
-        decision = session_state.setdefault(
-            "decision",
-            {
-                "status": "pending",
-                "confidence": 0.0,
-                "reasons": [],
-                "assumptions": [],
-                "open_questions": [],
-            },
-        )
-        decision["open_questions"] = [item.strip() for item in open_items.splitlines() if item.strip()]
+        decision = session_state.get("decision")
+        if decision is None:
+            decision = session_state["decision"] = copy.deepcopy(_DECISION_TEMPLATE)
+        decision["open_questions"] = _clean_lines(open_items)
     return "Spec saved."
 
 
 def record_ingredients(session_state, ingredients: str) -> str:
     """Persist latest ingredient list."""
 
-    outputs = session_state.setdefault(
-        "outputs",
-        {"images": [], "spec": None, "bom": [], "ingredients": [], "manufacturers": []},
-    )
-    outputs["ingredients"] = [line.strip() for line in ingredients.splitlines() if line.strip()]
+    outputs = _ensure_outputs(session_state)
+    outputs["ingredients"] = _clean_lines(ingredients)
     return "Ingredients saved."
 
 
 def record_manufacturers(session_state, manufacturers: str) -> str:
     """Persist manufacturer leads."""
 
-    outputs = session_state.setdefault(
-        "outputs",
-        {"images": [], "spec": None, "bom": [], "ingredients": [], "manufacturers": []},
-    )
-    outputs["manufacturers"] = [line.strip() for line in manufacturers.splitlines() if line.strip()]
+    outputs = _ensure_outputs(session_state)
+    outputs["manufacturers"] = _clean_lines(manufacturers)
     return "Manufacturers saved."
 
 
-def _generate_media_impl(agent: Agent, prompt: str) -> ToolResult:
-    """Generate an image via Replicate Seedream and persist the URL."""
+async def delegate_parallel(team: Team, members: list[str], prompt: str) -> str:
+    """Run the same task on independent members concurrently and collect replies."""
 
-    api_token = os.environ.get("REPLICATE_API_TOKEN")
-    if not api_token:
-        return ToolResult(content="Replicate token missing. Set REPLICATE_API_TOKEN.")
+    roster = {get_member_id(member): member for member in team.members}
+    wanted = [member_id.strip().lower() for member_id in members]
+    unknown = [member_id for member_id in wanted if member_id not in roster]
+    if unknown or not wanted:
+        return "No delegation. Pick members from: " + ", ".join(roster)
 
-    try:
-        import replicate
-    except ImportError:  # pragma: no cover - defensive guard
-        return ToolResult(content="`replicate` package missing. Run `pip install replicate`.")
+    selected = [roster[member_id] for member_id in dict.fromkeys(wanted)]
+    replies = await asyncio.gather(
+        *(member.arun(prompt) for member in selected), return_exceptions=True
+    )
+
+    sections = []
+    for member, reply in zip(selected, replies):
+        if isinstance(reply, Exception):
+            body = f"Delegation failed: {reply}"
+        else:
+            body = str(reply.content or "").strip() or "No response."
+        sections.append(f"{member.name}:\n{body}")
+    return "\n\n".join(sections)
+
+
+_OUTREACH_CONCURRENCY = 8
+
+
+async def draft_outreach_bulk(session_state, template: str) -> str:
+    """Draft one outreach message per saved manufacturer lead, concurrently."""
+
+    outputs = _ensure_outputs(session_state)
+    leads = outputs.get("manufacturers") or []
+    if not leads:
+        return "No manufacturer leads saved yet. Use record_manufacturers first."
+
+    semaphore = asyncio.Semaphore(_OUTREACH_CONCURRENCY)
+
+    async def _draft(lead: str):
+        prompt = (
+            f"Manufacturer lead: {lead}\n"
+            f"Adapt this outreach template to the lead:\n{template.strip()}"
+        )
+        async with semaphore:
+            return await outreach_agent.arun(prompt)
+
+    replies = await asyncio.gather(*(_draft(lead) for lead in leads), return_exceptions=True)
+
+    drafts = []
+    failures = 0
+    for lead, reply in zip(leads, replies):
+        if isinstance(reply, Exception):
+            logger.error("draft_outreach_bulk: draft failed", extra={"lead": lead, "error": str(reply)})
+            failures += 1
+            continue
+        drafts.append({"lead": lead, "message": str(reply.content or "").strip()})
+
+    outputs.setdefault("outreach", []).extend(drafts)
+    summary = f"Drafted outreach for {len(drafts)} of {len(leads)} leads."
+    if failures:
+        summary += f" {failures} failed; retry those later."
+    return summary
 
-    model_id = os.environ.get("REPLICATE_MODEL", "bytedance/seedream-4")
 
-    request = {
-        "prompt": prompt,
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    if isinstance(exc, httpx.TransportError):  # includes timeouts
+        return True
+    # replicate.exceptions.ReplicateError carries the HTTP status as `status`.
+    return getattr(exc, "status", None) in _RETRYABLE_STATUS
+
+
+def _retry(fn, *, attempts: int = 3, base: float = 0.25):
+    """Call fn, retrying transient HTTP failures with jittered exponential backoff."""
+
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as exc:
+            if attempt == attempts - 1 or not _is_transient(exc):
+                raise
+            delay = base * 2**attempt + random.uniform(0, 0.1)
+            logger.warning("retrying after transient error", extra={"error": str(exc), "delay": delay})
+            time.sleep(delay)
+
+
+async def _aretry(fn, *, attempts: int = 3, base: float = 0.25):
+    """Await fn(), retrying transient HTTP failures with jittered exponential backoff."""
+
+    for attempt in range(attempts):
+        try:
+            return await fn()
+        except Exception as exc:
+            if attempt == attempts - 1 or not _is_transient(exc):
+                raise
+            delay = base * 2**attempt + random.uniform(0, 0.1)
+            logger.warning("retrying after transient error", extra={"error": str(exc), "delay": delay})
+            await asyncio.sleep(delay)
+
+
+@lru_cache(maxsize=4)
+def _get_replicate_client(api_token: str):
+    """Return a Replicate client per token so its HTTP pool is reused."""
+
+    return replicate.Client(api_token=api_token)
+
+
+def _iter_urls(outputs):
+    """Yield image URLs from Replicate output: a FileOutput, a str, or a list of either."""
+
+    items = outputs if isinstance(outputs, (list, tuple)) else (outputs,)
+    for item in items:
+        if FileOutput is not None and isinstance(item, FileOutput):
+            url = getattr(item, "url", None)
+        elif isinstance(item, str):
+            url = item
+        else:
+            continue
+        if url:
+            yield url
+
+
+@lru_cache(maxsize=1)
+def _replicate_template() -> MappingProxyType:
+    """Snapshot the REPLICATE_* input settings once; call cache_clear() after changing them."""
+
+    template = {
         "sequential_image_generation": os.environ.get("REPLICATE_SEQ_MODE", "disabled"),
         "max_images": int(os.environ.get("REPLICATE_MAX_IMAGES", "1")),
         "size": os.environ.get("REPLICATE_SIZE", "2K"),
@@ -256,68 +498,150 @@ def _generate_media_impl(agent: Agent, prompt: str) -> ToolResult:
 
     aspect_ratio = os.environ.get("REPLICATE_ASPECT_RATIO")
     if aspect_ratio:
-        request["aspect_ratio"] = aspect_ratio
+        template["aspect_ratio"] = aspect_ratio
 
     width = os.environ.get("REPLICATE_WIDTH")
     height = os.environ.get("REPLICATE_HEIGHT")
     if width and height:
-        request["size"] = "custom"
-        request["width"] = int(width)
-        request["height"] = int(height)
+        template["size"] = "custom"
+        template["width"] = int(width)
+        template["height"] = int(height)
 
-    client = replicate.Client(api_token=api_token)
+    return MappingProxyType(template)
 
-    try:
-        outputs = client.run(model_id, input=request)
-    except Exception as exc:  # pragma: no cover - API error surface
-        return ToolResult(content=f"Replicate error: {exc}")
 
-    urls = []
-    file_outputs = []
+def _replicate_request(prompt: str) -> dict:
+    """Build the Replicate input for one prompt."""
 
-    try:
-        from replicate.helpers import FileOutput  # type: ignore
-    except ImportError:
-        FileOutput = None  # pragma: no cover
-
-    if FileOutput and isinstance(outputs, FileOutput):
-        file_outputs = [outputs]
-    elif isinstance(outputs, (list, tuple)):
-        for item in outputs:
-            if FileOutput and isinstance(item, FileOutput):
-                file_outputs.append(item)
-            elif isinstance(item, str):
-                urls.append(item)
-    elif isinstance(outputs, str):
-        urls.append(outputs)
-
-    for file_output in file_outputs:
-        url = getattr(file_output, "url", None)
-        if url:
-            urls.append(url)
+    return {**_replicate_template(), "prompt": prompt}
 
-    image_url = urls[0] if urls else None
+
+def _record_image(agent: Agent, prompt: str, image_url: str) -> None:
+    """Append a generated image to the team's session outputs when reachable."""
 
     session_state = getattr(agent, "session_state", None)
     if session_state is None and hasattr(agent, "team"):
         session_state = getattr(agent.team, "session_state", None)
 
-    if isinstance(session_state, dict) and image_url:
-        outputs_state = session_state.setdefault(
-            "outputs",
-            {"images": [], "spec": None, "bom": [], "ingredients": [], "manufacturers": []},
-        )
+    if isinstance(session_state, dict):
+        outputs_state = _ensure_outputs(session_state)
         images_state = outputs_state.setdefault("images", [])
         images_state.append({"prompt": prompt, "url": image_url})
 
-    if image_url:
-        images = [Image(id=str(uuid4()), url=url) for url in urls if url]
-        return ToolResult(content=image_url, images=images or None)
 
-    return ToolResult(content="Replicate did not return any image URLs.")
+def _generate_media_impl(agent: Agent, prompt: str) -> ToolResult:
+    """Generate an image via Replicate Seedream and persist the URL."""
+
+    api_token = os.environ.get("REPLICATE_API_TOKEN")
+    if not api_token:
+        return ToolResult(content="Replicate token missing. Set REPLICATE_API_TOKEN.")
+
+    if replicate is None:  # pragma: no cover - defensive guard
+        return ToolResult(content="`replicate` package missing. Run `pip install replicate`.")
+
+    model_id = os.environ.get("REPLICATE_MODEL", "bytedance/seedream-4")
+    request = _replicate_request(prompt)
+    client = _get_replicate_client(api_token)
+
+    try:
+        outputs = _retry(lambda: client.run(model_id, input=request))
+    except Exception as exc:  # pragma: no cover - API error surface
+        return ToolResult(content=f"Replicate error: {exc}")
+
+    urls = list(_iter_urls(outputs))
+    if not urls:
+        return ToolResult(content="Replicate did not return any image URLs.")
+
+    _record_image(agent, prompt, urls[0])
+    images = [Image(id=str(uuid4()), url=url) for url in urls]
+    return ToolResult(content=urls[0], images=images)
+
+
+async def _generate_media_batch_impl(agent: Agent, prompts: list[str] | str) -> ToolResult:
+    """Generate one image per prompt via Replicate, running the predictions concurrently."""
+
+    api_token = os.environ.get("REPLICATE_API_TOKEN")
+    if not api_token:
+        return ToolResult(content="Replicate token missing. Set REPLICATE_API_TOKEN.")
+
+    if replicate is None:  # pragma: no cover - defensive guard
+        return ToolResult(content="`replicate` package missing. Run `pip install replicate`.")
+
+    if isinstance(prompts, str):
+        prompts = [prompts]
+    prompts = [prompt.strip() for prompt in prompts if prompt and prompt.strip()]
+    if not prompts:
+        return ToolResult(content="Image batch needs at least one non-empty prompt.")
+
+    model_id = os.environ.get("REPLICATE_MODEL", "bytedance/seedream-4")
+    # Replicate caches its async HTTP client on first use, tying it to this
+    # loop, so the batch gets its own client rather than the shared sync one.
+    client = replicate.Client(api_token=api_token)
+
+    def _predict(prompt: str):
+        request = _replicate_request(prompt)
+        return _aretry(lambda: client.async_run(model_id, input=request))
+
+    results = await asyncio.gather(*(_predict(prompt) for prompt in prompts), return_exceptions=True)
+
+    lines = []
+    images = []
+    for idx, (prompt, outputs) in enumerate(zip(prompts, results), start=1):
+        if isinstance(outputs, Exception):
+            lines.append(f"{idx}. Replicate error: {outputs}")
+            continue
+        urls = list(_iter_urls(outputs))
+        if not urls:
+            lines.append(f"{idx}. Replicate did not return any image URLs.")
+            continue
+        _record_image(agent, prompt, urls[0])
+        images.extend(Image(id=str(uuid4()), url=url) for url in urls)
+        lines.append(f"{idx}. {urls[0]}")
+
+    return ToolResult(content="\n".join(lines), images=images or None)
 
 
 generate_media = tool(name="generate_media")(_generate_media_impl)
+generate_media_batch = tool(name="generate_media_batch")(_generate_media_batch_impl)
+
+
+_PERPLEXITY_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+_PERPLEXITY_CONCURRENCY = max(1, int(os.environ.get("PERPLEXITY_CONCURRENCY", "5")))
+
+
+@lru_cache(maxsize=1)
+def _perplexity_client() -> httpx.Client:
+    """Return the HTTP client shared by every agent that calls Perplexity."""
+
+    client = httpx.Client(
+        http2=_HTTP2_AVAILABLE,
+        limits=_PERPLEXITY_LIMITS,
+        headers={"Content-Type": "application/json"},
+    )
+    atexit.register(client.close)
+    return client
+
+
+def _post_perplexity(base_url: str, headers: dict, payload: dict, timeout: float) -> dict:
+    def _post() -> httpx.Response:
+        response = _perplexity_client().post(base_url, headers=headers, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response
+
+    return _retry(_post).json()
+
+
+def _perplexity_search_many(
+    queries: list[str], base_url: str, headers: dict, payload: dict, timeout: float
+) -> dict:
+    """Run one search per query concurrently and merge the per-query results."""
+
+    def _search(query: str) -> dict:
+        return _post_perplexity(base_url, headers, {**payload, "query": query}, timeout)
+
+    with ThreadPoolExecutor(max_workers=min(len(queries), _PERPLEXITY_CONCURRENCY)) as pool:
+        responses = list(pool.map(_search, queries))
+    return {"results": [response.get("results") or [] for response in responses]}
 
 
 @tool(
@@ -366,10 +690,7 @@ def perplexity_search(
     timeout = max(1.0, float(timeout_ms) / 1000.0) if timeout_ms else 30.0
     base_url = os.environ.get("PERPLEXITY_SEARCH_URL", "https://api.perplexity.ai/search")
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+    headers = {"Authorization": f"Bearer {api_key}"}
 
     logger.info(
         "perplexity_search: sending request", extra={
@@ -381,9 +702,10 @@ def perplexity_search(
     )
 
     try:
-        response = httpx.post(base_url, headers=headers, json=payload, timeout=timeout)
-        response.raise_for_status()
-        data = response.json()
+        if isinstance(normalized_query, list):
+            data = _perplexity_search_many(normalized_query, base_url, headers, payload, timeout)
+        else:
+            data = _post_perplexity(base_url, headers, payload, timeout)
     except httpx.HTTPStatusError as exc:
         logger.error(
             "perplexity_search: HTTP error",
@@ -405,9 +727,9 @@ def perplexity_search(
         logger.warning("perplexity_search: no results", extra={"query": normalized_query})
         return ToolResult(content="Perplexity search returned no results.", data=data)
 
-    lines: list[str] = []
+    sections: list[list[str]] = []
 
-    def _format_result(idx: int, item: dict[str, object]) -> None:
+    def _format_result(lines: list[str], idx: int, item: dict[str, object]) -> None:
         title = str(item.get("title") or "Untitled result").strip()
         url = str(item.get("url") or "").strip()
         snippet = str(item.get("snippet") or "").strip()
@@ -429,24 +751,51 @@ def perplexity_search(
     if isinstance(normalized_query, list):
         for q_index, query_results in enumerate(results):
             query_prompt = normalized_query[q_index] if q_index < len(normalized_query) else f"query #{q_index + 1}"
-            lines.append(f"Query {q_index + 1}: {query_prompt}")
+            section = [f"Query {q_index + 1}: {query_prompt}"]
             if not query_results:
-                lines.append("   No results returned.")
+                section.append("   No results returned.")
             else:
                 for res_index, item in enumerate(query_results, start=1):
                     if isinstance(item, dict):
-                        _format_result(res_index, item)
-            lines.append("")
+                        _format_result(section, res_index, item)
+            sections.append(section)
     else:
+        section = []
         for res_index, item in enumerate(results, start=1):
             if isinstance(item, dict):
-                _format_result(res_index, item)
+                _format_result(section, res_index, item)
+        sections.append(section)
 
-    content = "\n".join(line for line in lines if line.strip())
-    logger.info("perplexity_search: returning results", extra={"num_lines": len(lines)})
+    content = "\n\n".join("\n".join(section) for section in sections)
+    logger.info(
+        "perplexity_search: returning results",
+        extra={"num_lines": sum(len(section) for section in sections)},
+    )
     return ToolResult(content=content, data=data)
 
 
+async def warm_connections() -> None:
+    """Open pooled connections to OpenRouter and Perplexity before the first run."""
+
+    perplexity_url = os.environ.get("PERPLEXITY_SEARCH_URL", "https://api.perplexity.ai/search")
+    results = await asyncio.gather(
+        _openrouter_http_client().head("https://openrouter.ai/api/v1/models"),
+        asyncio.to_thread(_perplexity_client().head, perplexity_url),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("warm_connections: pre-warm failed", extra={"error": str(result)})
+
+
+async def close_connections() -> None:
+    """Close the running loop's pooled OpenRouter client when it shuts down."""
+
+    client = _OPENROUTER_HTTP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 def _extract_user_query(run_output) -> str:
     """Pull the latest user query from the run output context."""
 
@@ -465,10 +814,30 @@ def _extract_user_query(run_output) -> str:
     return ""
 
 
-def ensure_perplexity_usage(run_output, agent: Agent, **_kwargs) -> None:
-    """Guarantee Perplexity-backed output for research and sourcing agents."""
+_PERPLEXITY_AGENTS = frozenset({"ResearchAgent", "SourcingAgent"})
+# Bounds concurrent fallback searches when several agents finish at once. A
+# thread semaphore, taken inside the worker thread, works across event loops.
+_PERPLEXITY_FALLBACK_SEMAPHORE = threading.BoundedSemaphore(_PERPLEXITY_CONCURRENCY)
+
+
+def _fallback_search(agent: Agent, query: str) -> ToolResult:
+    with _PERPLEXITY_FALLBACK_SEMAPHORE:
+        return perplexity_search.entrypoint(
+            agent=agent,
+            query=query,
+            max_results=10,
+            max_tokens_per_page=1024,
+        )
+
+
+async def ensure_perplexity_usage(run_output, agent: Agent, **_kwargs) -> None:
+    """Guarantee Perplexity-backed output for research and sourcing agents.
 
-    if agent.name not in {"ResearchAgent", "SourcingAgent"}:
+    Async so the fallback search runs off the event loop; other members and
+    sessions keep streaming while it waits on the network.
+    """
+
+    if agent.name not in _PERPLEXITY_AGENTS:
         return
 
     tool_calls = getattr(run_output, "tool_calls", None)
@@ -478,12 +847,7 @@ def ensure_perplexity_usage(run_output, agent: Agent, **_kwargs) -> None:
     query = _extract_user_query(run_output) or "latest market research"
 
     try:
-        tool_result = perplexity_search.entrypoint(
-            agent=agent,
-            query=query,
-            max_results=10,
-            max_tokens_per_page=1024,
-        )
+        tool_result = await asyncio.to_thread(_fallback_search, agent, query)
     except Exception as exc:  # pragma: no cover - surface plainly
         failure_note = f"Perplexity search failed: {exc}"
         run_output.content = (
@@ -496,37 +860,36 @@ def ensure_perplexity_usage(run_output, agent: Agent, **_kwargs) -> None:
     run_output.content = "\n\n".join(part for part in summary_parts if part)
 
 
+_PROMPT_RE = re.compile(r"suggested\s+future\s+image\s+prompt\s*[:：]\s*(.+)", re.IGNORECASE)
+_MD_RE = re.compile(r"[*_`]+")
+_NICK_RE = re.compile(r"nickname\s*[:：]\s*([^\n]+)", re.IGNORECASE)
+# A bare "Nickname:" label whose value sits on the next non-empty line.
+_NICK_LABEL_RE = re.compile(r"nickname\s*[:：][\s*_`]*$", re.IGNORECASE)
+_EXISTING_URL_RE = re.compile(
+    r"Image URL:\s*https?://(?:[\w-]+\.)*(?:replicate\.delivery|r2\.cloudflarestorage\.com)/\S+",
+    re.IGNORECASE,
+)
+# Lines that carry prompt/URL scaffolding or raw tool-call markup.
+_STRIP_RE = re.compile(
+    r"suggested future image prompt|image url|<xai:function_call|<function_call|<parameter|<argument",
+    re.IGNORECASE,
+)
+
+
 def _extract_prompt(text: str) -> str:
     """Return the suggested prompt from the agent's response if present."""
 
-    pattern = re.compile(r"suggested\s+future\s+image\s+prompt\s*[:：]\s*(.+)", re.IGNORECASE)
     for line in text.splitlines():
-        match = pattern.search(line)
+        match = _PROMPT_RE.search(line)
         if match:
             return match.group(1).strip().strip("`").strip()
     return ""
 
 
-def _strip_prompt_line(text: str) -> str:
-    cleaned_lines = []
-    for line in text.splitlines():
-        lower = line.lower()
-        if "suggested future image prompt" in lower:
-            continue
-        if "image url" in lower:
-            continue
-        if "<xai:function_call" in lower or "<function_call" in lower:
-            continue
-        if "<parameter" in lower or "<argument" in lower:
-            continue
-        cleaned_lines.append(line)
-    return "\n".join(cleaned_lines).strip()
-
-
 def _collapse_markdown(text: str) -> str:
     """Simplify markdown formatting for alt text and summary lines."""
 
-    cleaned = re.sub(r"[*_`]+", "", text)
+    cleaned = _MD_RE.sub("", text)
     return " ".join(cleaned.split())
 
 
@@ -537,18 +900,42 @@ def _normalize_prompt(prompt: str) -> str:
     return cleaned
 
 
-def _first_sentence(text: str) -> str:
-    """Extract the first meaningful sentence from markdown-ish content."""
+def _summarize_visual(text: str) -> tuple[str, str]:
+    """Return (first sentence, nickname alt text) from one pass over the lines.
+
+    The first sentence skips prompt/URL scaffolding and nickname lines; the
+    nickname may sit on any line, or on the line after a bare label.
+
+    >>> _summarize_visual("Calm bar in sage paper.\\nNickname: Calm Trail Bar")
+    ('Calm bar in sage paper.', 'Calm Trail Bar')
+    >>> _summarize_visual("**Nickname:**\\n\\nCalm Trail Bar\\nCalm bar in sage paper.")
+    ('Calm bar in sage paper.', 'Calm Trail Bar')
+    """
 
+    description = ""
+    alt_text = ""
+    awaiting_nickname = False
     for line in text.splitlines():
-        cleaned = line.strip()
-        if not cleaned:
+        if awaiting_nickname:
+            if not line.strip():
+                continue
+            awaiting_nickname = False
+            if not alt_text:
+                alt_text = _collapse_markdown(line)
+            continue
+        if _NICK_LABEL_RE.search(line):
+            awaiting_nickname = True
+            continue
+        nickname_match = _NICK_RE.search(line)
+        if nickname_match:
+            if not alt_text:
+                alt_text = _collapse_markdown(nickname_match.group(1))
             continue
-        cleaned = cleaned.lstrip("-•*").strip()
-        cleaned = _collapse_markdown(cleaned)
-        if cleaned:
-            return cleaned
-    return "Here's the mockup we generated."
+        if not description and not _STRIP_RE.search(line):
+            description = _collapse_markdown(line.strip().lstrip("-•*").strip())
+        if description and alt_text:
+            break
+    return description or "Here's the mockup we generated.", alt_text or "visual mockup"
 
 
 def attach_visual_mockup(run_output, agent: Agent, **_kwargs) -> None:
@@ -561,7 +948,7 @@ def attach_visual_mockup(run_output, agent: Agent, **_kwargs) -> None:
     if not content:
         return
 
-    if "Image URL:" in content and "replicate.delivery" in content:
+    if _EXISTING_URL_RE.search(content):
         # Already contains a concrete link from Replicate.
         return
 
@@ -584,13 +971,7 @@ def attach_visual_mockup(run_output, agent: Agent, **_kwargs) -> None:
         run_output.content = f"{content}\nImage generation failed: {tool_result.content or 'No image URL returned.'}"
         return
 
-    summary_text = _strip_prompt_line(content)
-    alt_text = "visual mockup"
-    nickname_match = re.search(r"nickname\s*[:：]\s*([^\n]+)", content, re.IGNORECASE)
-    if nickname_match:
-        alt_text = _collapse_markdown(nickname_match.group(1))
-
-    description = _first_sentence(summary_text)
+    description, alt_text = _summarize_visual(content)
 
     final_parts = [description]
     prompt_line = _normalize_prompt(prompt) if prompt else ""
@@ -603,23 +984,22 @@ def attach_visual_mockup(run_output, agent: Agent, **_kwargs) -> None:
     run_output.images = getattr(tool_result, "images", None)
 
 
+_RESEARCH_INSTRUCTIONS = """\
+Investigate the concept with up-to-date market context and provide:
+- viability verdict (viable / not_viable / uncertain) with a short vibe-check summary.
+- confidence score out of 100.
+- three strongest supporting or blocking signals with citations or source notes.
+- any blockers that require user input before moving forward.
+You MUST call `perplexity_search` at least once before finalizing a response. If the tool errors, surface the failure instead of guessing.
+If you cannot find recent evidence, be explicit instead of guessing.
+Keep the tone plain language and explain like a teammate."""
+
 research_agent = Agent(
     name="ResearchAgent",
     role="Evaluate market viability with grounded citations.",
-    model=OpenRouter(id="google/gemini-2.5-flash-preview-09-2025"),
+    model=_GEMINI_FLASH_MODEL,
     reasoning=True,
-    instructions=dedent(
-        """
-        Investigate the concept with up-to-date market context and provide:
-        - viability verdict (viable / not_viable / uncertain) with a short vibe-check summary.
-        - confidence score out of 100.
-        - three strongest supporting or blocking signals with citations or source notes.
-        - any blockers that require user input before moving forward.
-        You MUST call `perplexity_search` at least once before finalizing a response. If the tool errors, surface the failure instead of guessing.
-        If you cannot find recent evidence, be explicit instead of guessing.
-        Keep the tone plain language and explain like a teammate.
-        """
-    ).strip(),
+    instructions=_RESEARCH_INSTRUCTIONS,
     tools=[perplexity_search],
     post_hooks=[ensure_perplexity_usage],
     tool_call_limit=1,
@@ -627,70 +1007,68 @@ research_agent = Agent(
 )
 
 
+_VISUAL_INSTRUCTIONS = """\
+Deliver one visual direction concept. Include:
+- a friendly nickname.
+- two quick bullets covering palette & typography vibe, plus packaging cues.
+- a suggested future image prompt (keep it short and vivid).
+When the user explicitly asks for a visual or mockup, you MUST call `generate_media` exactly once before replying. Never fabricate or guess an image URL.
+If the user asks for several variations, call `generate_media_batch` once with one prompt per variation instead of calling `generate_media` repeatedly, and give each variation its own `Image URL:` line and embed.
+After the tool returns, reply with:
+- one short description sentence (no headings, no lists);
+- a line that begins with `Image URL:` plus the exact Replicate URL (no shortening);
+- a markdown image embed on the next line using the format `![alt text](URL)` so the interface displays it inline.
+Skip any extra analysis, tables, or section headers once the image is delivered.
+If Replicate returns an error or no URL, say so clearly and skip the mockup instead of improvising.
+Keep language informal ("here's a playful take" vs. corporate)."""
+
 visual_agent = Agent(
     name="VisualAgent",
     role="Craft lightweight mockups and brand direction concepts.",
-    model=OpenRouter(id="x-ai/grok-4-fast", reasoning_effort="medium"),
+    model=_GROK_REASONING_MODEL,
     reasoning=True,
-    tools=[generate_media],
+    tools=[generate_media, generate_media_batch],
     post_hooks=[attach_visual_mockup],
-    instructions=dedent(
-        """
-        Deliver one visual direction concept. Include:
-        - a friendly nickname.
-        - two quick bullets covering palette & typography vibe, plus packaging cues.
-        - a suggested future image prompt (keep it short and vivid).
-        When the user explicitly asks for a visual or mockup, you MUST call `generate_media` exactly once before replying. Never fabricate or guess an image URL.
-        After the tool returns, reply with:
-        - one short description sentence (no headings, no lists);
-        - a line that begins with `Image URL:` plus the exact Replicate URL (no shortening);
-        - a markdown image embed on the next line using the format `![alt text](URL)` so the interface displays it inline.
-        Skip any extra analysis, tables, or section headers once the image is delivered.
-        If Replicate returns an error or no URL, say so clearly and skip the mockup instead of improvising.
-        Keep language informal ("here's a playful take" vs. corporate).
-        """
-    ).strip(),
+    instructions=_VISUAL_INSTRUCTIONS,
     markdown=True,
 )
 
 
+_PRODUCT_INSTRUCTIONS = """\
+Turn the approved concept into a concise spec:
+- core value prop, target user notes, success criteria.
+- BOM table with draft cost targets.
+- compliance or testing watch-outs.
+- tiny action list of what still needs answering.
+Don't invent sourcing details—leave that for SourcingAgent.
+You MUST trigger perplexity_search at least once per request. If the tool fails, report the failure instead of guessing.
+Keep the tone plain language and explain like a teammate."""
+
 product_agent = Agent(
     name="ProductAgent",
     role="Draft a buildable product spec and lightweight plan.",
-    model=OpenRouter(id="x-ai/grok-4-fast", reasoning_effort="medium"),
+    model=_GROK_REASONING_MODEL,
     reasoning=True,
-    instructions=dedent(
-        """
-        Turn the approved concept into a concise spec:
-        - core value prop, target user notes, success criteria.
-        - BOM table with draft cost targets.
-        - compliance or testing watch-outs.
-        - tiny action list of what still needs answering.
-        Don't invent sourcing details—leave that for SourcingAgent.
-        You MUST trigger perplexity_search at least once per request. If the tool fails, report the failure instead of guessing.
-        Keep the tone plain language and explain like a teammate.
-        """
-    ).strip(),
+    instructions=_PRODUCT_INSTRUCTIONS,
     markdown=True,
 )
 
 
+_SOURCING_INSTRUCTIONS = """\
+Compile sourcing insights with any references you can surface:
+- full ingredient/inputs list with quick justification per item.
+- 5–10 manufacturer leads (company, region, MOQ, strengths, contact link).
+- a short email/DM template for outreach.
+Flag gaps or lead quality issues plainly.
+You MUST trigger perplexity_search at least once per request. If the tool fails, report the failure instead of guessing.
+Keep the tone plain language and explain like a teammate."""
+
 sourcing_agent = Agent(
     name="SourcingAgent",
     role="Find ingredients and manufacturing partners.",
-    model=OpenRouter(id="google/gemini-2.5-flash-preview-09-2025"),
+    model=_GEMINI_FLASH_MODEL,
     reasoning=True,
-    instructions=dedent(
-        """
-        Compile sourcing insights with any references you can surface:
-        - full ingredient/inputs list with quick justification per item.
-        - 5–10 manufacturer leads (company, region, MOQ, strengths, contact link).
-        - a short email/DM template for outreach.
-        Flag gaps or lead quality issues plainly.
-        You MUST trigger perplexity_search at least once per request. If the tool fails, report the failure instead of guessing.
-        Keep the tone plain language and explain like a teammate.
-        """
-    ).strip(),
+    instructions=_SOURCING_INSTRUCTIONS,
     tools=[perplexity_search],
     post_hooks=[ensure_perplexity_usage],
     tool_call_limit=1,
@@ -698,6 +1076,21 @@ sourcing_agent = Agent(
 )
 
 
+# Writes outreach drafts for draft_outreach_bulk. Not a team member: it has
+# no search tool or post-hook, so each draft is a single model call.
+_OUTREACH_INSTRUCTIONS = """\
+Rewrite the outreach template for the given manufacturer lead.
+Reply with the message only—no preamble—and keep it short and friendly.
+Don't invent facts about the lead beyond what you're given."""
+
+outreach_agent = Agent(
+    name="OutreachAgent",
+    role="Adapt outreach templates to individual manufacturer leads.",
+    model=_GEMINI_FLASH_MODEL,
+    instructions=_OUTREACH_INSTRUCTIONS,
+)
+
+
 APPROVAL_CUES = (
     "yeah",
     "yep",
@@ -718,47 +1111,67 @@ APPROVAL_CUES = (
     "sure thing",
 )
 
+# The tuple keeps prompt text in a stable order; the set serves lookups.
+_APPROVAL_CUE_SET = frozenset(APPROVAL_CUES)
+_APPROVAL_EXAMPLES = ", ".join(APPROVAL_CUES)
+# Matched against lowercased text: a case-sensitive pattern with a first-letter
+# lookahead rejects non-cue words about 3x faster than (?i) alone.
+_APPROVAL_RE = re.compile(
+    r"\b(?=[" + "".join(sorted({cue[0] for cue in _APPROVAL_CUE_SET})) + r"])"
+    r"(?:" + "|".join(map(re.escape, APPROVAL_CUES)) + r")\b"
+)
+
+
+def is_approval(text: str) -> bool:
+    """Return True when a message contains one of the casual approval cues."""
+
+    return _APPROVAL_RE.search(text.lower().replace("\u2019", "'")) is not None
+
 
-TEAM_INSTRUCTIONS = dedent(
+# The session snapshot is the only part that changes between turns, so it goes
+# last: everything before it stays a byte-identical prefix the provider can
+# serve from its prompt cache. $-slots are filled here at import; the {stage}
+# style slots are left for Agno to fill from session_state on each turn.
+TEAM_INSTRUCTIONS = sys.intern(Template(dedent(
     """
     You are CoordinatorPM leading the Product Studio Team. Use natural, human language—no formal sign-offs.
 
-    Snapshot (auto-filled from session state):
-    - stage: {{stage}}
-    - awaiting_approval: {{awaiting_approval}}
-    - approvals: {{approvals}}
-    - brief: {{brief}}
-    - selected_visual: {{selected_visual}}
-
     Stage order: intake → viability → visuals → spec → sourcing → final. Only move forward when the user vibes with the current stage.
 
     Tools you can call:
     - set_stage(stage="...")
     - set_awaiting(awaiting=True|False)
     - mark_approval(gate="viability|visuals|spec", value=True|False)
+    - commit_state_tweaks(approvals={"viability": True}, awaiting_approval=False, stage="visuals")
     - record_visual_choice(option_id="mockup", notes="...")
     - record_brief(key="format", value="bar soap")
+    - record_brief_multi(details={"format": "bar soap", "goal": "relaxation"})
     - record_spec(summary=\"...\", bom=\"...\", open_items=\"...\")
     - record_ingredients(\"ingredient bullet list\")
     - record_manufacturers(\"manufacturer bullet list\")
+    - delegate_parallel(members=["researchagent", "visualagent"], prompt="...")
+    - draft_outreach_bulk(template="...")
+    - is_approval(text="user message") → True when it contains one of the approval cues below
 
     Tool usage pattern example:
     - User: "Make it a bar soap focused on relaxation."
-    - You: call record_brief("format", "bar soap") and record_brief("goal", "relaxation"), optionally set_awaiting(False), then acknowledge the update conversationally.
+    - You: call record_brief_multi(details={"format": "bar soap", "goal": "relaxation"}) once rather than one record_brief per fact, optionally set_awaiting(False), then acknowledge the update conversationally.
     - Before responding during viability, call set_stage("viability"), delegate_task_to_member with member_id="researchagent", and wait for their reply. Remind them to run `perplexity_search` for fresh sources; if their answer lacks Perplexity-backed citations or reports a failure, ask them to retry instead of answering yourself.
     - Only advance stages with explicit approvals, and always call set_stage/mark_approval so the state persists for later turns.
+    - Members don't see each other's replies. When delegating, pass along the session_state facts they need (brief, selected visual, saved spec) in a few lines rather than pasting earlier replies.
 
     Approvals:
-    - Treat casual phrases like {approval_examples} as a thumbs-up. Examples: "yeah I like that", "sounds good", "go ahead", "decide yourself".
+    - Treat casual phrases like $approval_examples as a thumbs-up. Examples: "yeah I like that", "sounds good", "go ahead", "decide yourself".
+    - If you can't tell whether a reply is a thumbs-up, call is_approval(text=...) on it rather than guessing.
     - If user hesitates ("hmm", "not sure", "can we tweak"), call the specialist again or ask clarifying questions.
-    - When you detect approval, call the tools above to update session_state (e.g. set_stage("viability"), mark_approval("viability"), set_awaiting(False)).
+    - When you detect approval, update session_state with a single commit_state_tweaks call (e.g. commit_state_tweaks(approvals={"viability": True}, awaiting_approval=False, stage="visuals")) instead of separate mark_approval/set_awaiting/set_stage calls.
 
     Stage duties:
-    - intake: recap the brief, fill gaps, remind the user what we still need. Use record_brief to stash facts (format, purpose, must-haves). If they say "decide yourself", go ahead and move to viability.
+    - intake: recap the brief, fill gaps, remind the user what we still need. Use record_brief to stash facts (format, purpose, must-haves). If they say "decide yourself", go ahead and move to viability: call set_stage("viability") and delegate_parallel(members=["researchagent", "visualagent"], prompt=...) so the viability check and an early mood board run at the same time. Share the viability take first and hold the mood board until viability is approved.
     - viability: delegate to ResearchAgent once you've got enough context. Summarize their take and wait for a chill approval. Never produce research findings yourself—always rely on ResearchAgent's Perplexity-backed response.
     - visuals: only after viability approval. Delegate to VisualAgent, have them share a single mockup concept, and make sure the user is good with it before moving forward. Capture the approval using record_visual_choice (e.g. option_id="mockup").
     - spec: after visuals approval. Have ProductAgent draft the spec, highlight open questions, pause for sign-off. Use record_spec to save the latest draft and open questions.
-    - sourcing: after spec approval. Delegate to SourcingAgent. Remind them to run `perplexity_search` before replying. Encourage the user to choose leads or ask for refinements. Use record_ingredients/record_manufacturers so we can reference them later.
+    - sourcing: after spec approval. Delegate to SourcingAgent. Remind them to run `perplexity_search` before replying. Encourage the user to choose leads or ask for refinements. Use record_ingredients/record_manufacturers so we can reference them later. Once leads are saved and the user wants outreach, call draft_outreach_bulk with SourcingAgent's template to draft every message in one go.
     - final: stitch everything into a tidy recap with next moves. Wrap warmly, no stiff corporate tone.
 
     Guardrails:
@@ -767,48 +1180,69 @@ TEAM_INSTRUCTIONS = dedent(
     - When rejecting a jump-ahead request, explain which approval we're waiting on and offer to revisit the current stage instead.
 
     Never loop stages automatically. If user says "revise <stage>" or gives feedback, revisit that stage before advancing. Keep answers short-ish, collaborative, and reference session_state so everyone stays aligned.
+
+    Snapshot (auto-filled from session state):
+    - stage: {stage}
+    - awaiting_approval: {awaiting_approval}
+    - approvals: {approvals}
+    - brief: {brief}
+    - selected_visual: {selected_visual}
     """
-).format(approval_examples=", ".join(APPROVAL_CUES))
+)).substitute(approval_examples=_APPROVAL_EXAMPLES))
 
 
 innovation_team = Team(
     name="ProductStudioTeam",
     members=[research_agent, visual_agent, product_agent, sourcing_agent],
-    model=OpenRouter(id="x-ai/grok-4-fast"),
+    model=_GROK_MODEL,
     instructions=TEAM_INSTRUCTIONS,
     show_members_responses=True,
-    share_member_interactions=True,
+    share_member_interactions=False,
     add_session_state_to_context=True,
     enable_agentic_state=True,
     add_history_to_context=True,
-    num_history_runs=3,
+    num_history_runs=1,
     search_session_history=True,
-    num_history_sessions=3,
+    num_history_sessions=1,
     session_state=initial_session_state(),
     tools=[
         set_stage,
         set_awaiting,
         mark_approval,
+        commit_state_tweaks,
         record_visual_choice,
         record_brief,
+        record_brief_multi,
         record_spec,
         record_ingredients,
         record_manufacturers,
+        delegate_parallel,
+        draft_outreach_bulk,
+        is_approval,
     ],
     db=team_database(),
 )
 
 
-def run_example() -> None:
-    """Fire the team with a sample brief."""
+def run_example(stream: bool = False) -> TeamRunOutput | None:
+    """Fire the team with a sample brief.
+
+    With stream=True the reply is rendered to the console as it arrives;
+    otherwise the run output is returned without any terminal rendering.
+    """
 
     prompt = "I want to create a lavender soap for Gen Z trail runners."
-    innovation_team.print_response(prompt, markdown=True)
+    if stream:
+        asyncio.run(innovation_team.aprint_response(prompt, markdown=True, stream=True))
+        return None
+    return asyncio.run(innovation_team.arun(prompt))
 
 
 __all__ = [
+    "close_connections",
     "innovation_team",
     "run_example",
+    "warm_connections",
 ]
 
 # --- add at bottom of the file ---
@@ -818,4 +1252,4 @@ if __name__ == "__main__":
     parser.add_argument("-m", "--message",
                         default="I want to create a lavender soap for Gen Z trail runners.")
     args = parser.parse_args()
-    innovation_team.print_response(args.message, markdown=True)
+    asyncio.run(innovation_team.aprint_response(args.message, markdown=True, stream=True))